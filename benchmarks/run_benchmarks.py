@@ -0,0 +1,455 @@
+"""
+Timed benchmarks for the dataset tools, the training data pipeline and inference.
+
+Generates a synthetic dataset (see synthetic_charts.py), times each benchmark and
+appends the results to a JSON history, so runs can be compared across commits.
+The training pipeline and inference benchmarks need ultralytics and are skipped
+when it is not installed. The decode benchmarks compare the plain PIL path with
+src/image_io.py, including the peak memory of each in a fresh process.
+
+Usage:
+  python benchmarks/run_benchmarks.py --count 500
+  python benchmarks/run_benchmarks.py --count 200 --resolutions 3840x2160 --only check
+  python benchmarks/run_benchmarks.py --reuse --weights path/to/best.pt
+  python benchmarks/run_benchmarks.py --only decode --resolutions 3840x2160 --ext .jpg
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+from PIL import Image
+
+REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO / "dataset_creation"))
+sys.path.insert(0, str(REPO / "src"))
+
+import align_label_filenames  # noqa: E402
+import check_yolo_dataset  # noqa: E402
+import dedupe_yolo_labels  # noqa: E402
+from synthetic_charts import (  # noqa: E402
+    LAYOUTS,
+    RESOLUTIONS,
+    generate,
+    is_synthetic,
+    load_params,
+    parse_resolutions,
+)
+
+from image_io import alloc_buffer, decode_into, fit_size, load_image  # noqa: E402
+
+HISTORY = REPO / "benchmarks" / "history.json"
+DATA_DIR = REPO / "benchmarks" / "synthetic"
+SPLITS = ("train", "val", "test")
+
+IMAGE_SIZE = 1792  # same as src/main.py
+WEIGHTS = "yolo12n.pt"
+REGRESSION_THRESHOLD = 0.10  # flag benchmarks that got >10% slower
+GROUPS = ["generate", "check", "decode", "train", "inference"]
+
+
+def timeit(fn: Callable[[], int], repeat: int) -> dict:
+    """
+    Run ``fn`` ``repeat`` times and return timing stats.
+
+    ``fn`` returns the number of items it processed, used for the throughput.
+    """
+    times = []
+    items = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = fn()
+        times.append(time.perf_counter() - start)
+    best = min(times)
+    return {
+        "repeat": repeat,
+        "items": items,
+        "min_s": best,
+        "mean_s": statistics.mean(times),
+        "median_s": statistics.median(times),
+        "items_per_s": items / best if best > 0 else None,
+    }
+
+
+def _quiet(fn: Callable[[], int]) -> Callable[[], int]:
+    """Wrap ``fn`` so the dataset tools' prints don't end up in the timings."""
+
+    def wrapped() -> int:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn()
+
+    return wrapped
+
+
+# -----------------
+# Benchmarks
+# -----------------
+
+
+def bench_check_dataset(root: Path) -> int:
+    check_yolo_dataset.ROOT = root
+    n = 0
+    for split in SPLITS:
+        check_yolo_dataset.check_split(split)
+        n += len(check_yolo_dataset.image_stems(split))
+    return n
+
+
+def bench_validate_labels(root: Path) -> int:
+    files = list((root / "labels").rglob("chart_*.txt"))
+    for p in files:
+        check_yolo_dataset.validate_label_file(p)
+    return len(files)
+
+
+def bench_align_labels(root: Path) -> int:
+    # Synthetic labels are already canonical, so this only scans and matches
+    align_label_filenames.ROOT = root
+    for split in SPLITS:
+        align_label_filenames.align_split(split)
+    return len(list((root / "labels").rglob("chart_*.txt")))
+
+
+def bench_dedupe_scan(root: Path) -> int:
+    files = dedupe_yolo_labels.collect_label_files(root / "labels", recursive=True)
+    files = [p for p in files if p.name.startswith("chart_")]  # skip classes.txt
+    dedupe_yolo_labels.group_by_base(files)
+    return len(files)
+
+
+def decode_pil(paths: list[str], max_size: int) -> int:
+    """Decode like the original code: full decode, convert to RGB, then resize."""
+    for p in paths:
+        img = Image.open(p).convert("RGB")
+        img = img.resize(fit_size(*img.size, max_size), Image.Resampling.BILINEAR)
+        np.asarray(img)
+    return len(paths)
+
+
+def decode_reduced(paths: list[str], max_size: int) -> int:
+    """Decode at reduced resolution into a new array per image (no buffer)."""
+    for p in paths:
+        np.asarray(load_image(p, max_size))
+    return len(paths)
+
+
+def decode_fast(paths: list[str], max_size: int) -> int:
+    """Decode at reduced resolution into one reused buffer (src/image_io.py)."""
+    buf = alloc_buffer(max_size)
+    for p in paths:
+        decode_into(p, buf, max_size)
+    return len(paths)
+
+
+# decode_reduced vs decode_fast isolates the effect of the reused buffer
+DECODERS = {
+    "decode_pil": decode_pil,
+    "decode_reduced": decode_reduced,
+    "decode_fast": decode_fast,
+}
+
+
+def _peak_rss() -> int | None:
+    """Return the peak resident memory of this process in bytes, if available."""
+    # VmHWM starts fresh after exec, unlike ru_maxrss which Linux carries over
+    # from the parent process
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return None
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    unit = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit
+
+
+def _peak_memory_worker(name: str, paths: list[str], max_size: int) -> int | None:
+    """Run a decoder and return how far it raised the process's peak memory."""
+    before = _peak_rss()
+    DECODERS[name](paths, max_size)
+    after = _peak_rss()
+    if before is None or after is None:
+        return None
+    return after - before
+
+
+def peak_memory(name: str, paths: list[str], max_size: int) -> int | None:
+    """Measure peak memory of a decoder in a fresh process, so runs don't mix."""
+    with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(_peak_memory_worker, name, paths, max_size).result()
+
+
+def bench_train_pipeline(data_yaml: Path, imgsz: int, limit: int) -> Callable:
+    """Return a benchmark that loads augmented training samples like model.train."""
+    from ultralytics.cfg import get_cfg
+    from ultralytics.data import build_yolo_dataset
+    from ultralytics.data.utils import check_det_dataset
+
+    data = check_det_dataset(str(data_yaml))
+    cfg = get_cfg(overrides={"imgsz": imgsz, "data": str(data_yaml)})
+    dataset = build_yolo_dataset(cfg, data["train"], batch=1, data=data, mode="train")
+    n = min(limit, len(dataset))
+
+    def run() -> int:
+        for i in range(n):
+            dataset[i]
+        return n
+
+    return run
+
+
+def bench_inference(root: Path, weights: str, imgsz: int, limit: int) -> Callable:
+    """Return a benchmark that runs model.predict over the synthetic test split."""
+    from ultralytics import YOLO
+
+    model = YOLO(weights)
+    paths = sorted(str(p) for p in (root / "images" / "test").iterdir())[:limit]
+    model.predict(paths[0], imgsz=imgsz, verbose=False)  # warm-up
+
+    def run() -> int:
+        for _ in model.predict(paths, imgsz=imgsz, verbose=False, stream=True):
+            pass
+        return len(paths)
+
+    return run
+
+
+def bench_inference_fast(root: Path, weights: str, imgsz: int, limit: int) -> Callable:
+    """Like bench_inference, but decodes with image_io into a reused buffer."""
+    from ultralytics import YOLO
+
+    model = YOLO(weights)
+    paths = sorted(str(p) for p in (root / "images" / "test").iterdir())[:limit]
+    buf = alloc_buffer(imgsz)
+    img = decode_into(paths[0], buf, imgsz, bgr=True)
+    model.predict(img, imgsz=imgsz, verbose=False)  # warm-up
+
+    def run() -> int:
+        for p in paths:
+            # Predict one image at a time, the next decode overwrites buf
+            img = decode_into(p, buf, imgsz, bgr=True)
+            model.predict(img, imgsz=imgsz, verbose=False)
+        return len(paths)
+
+    return run
+
+
+# -----------------
+# History
+# -----------------
+
+
+def git_commit() -> tuple[str | None, bool]:
+    """Return (short commit hash, working tree dirty) or (None, False)."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=REPO,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+    return commit, bool(status)
+
+
+def load_history(path: Path) -> list[dict]:
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    return []
+
+
+def save_history(path: Path, history: list[dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(history, indent=2), encoding="utf-8")
+
+
+def last_matching(history: list[dict], config: dict) -> dict | None:
+    """Return the most recent record that was run with the same ``config``."""
+    return next((r for r in reversed(history) if r["config"] == config), None)
+
+
+def compare(previous: dict, current: dict, threshold: float) -> list[str]:
+    """Return a line per benchmark that got slower than ``threshold`` allows."""
+    regressions = []
+    for name, res in current["results"].items():
+        prev = previous["results"].get(name)
+        if not prev:
+            continue
+        change = res["min_s"] / prev["min_s"] - 1 if prev["min_s"] else 0.0
+        line = (
+            f"{name}: {prev['min_s']:.4f}s -> {res['min_s']:.4f}s ({change:+.1%})"
+            f" vs {previous.get('commit')}"
+        )
+        print(f"[Bench] {line}")
+        if change > threshold:
+            regressions.append(line)
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--count", type=int, default=200, help="Synthetic images.")
+    ap.add_argument("--resolutions", type=parse_resolutions, default=RESOLUTIONS)
+    ap.add_argument("--layouts", type=lambda v: v.split(","), default=list(LAYOUTS))
+    ap.add_argument("--ext", choices=[".png", ".jpg"], default=".png")
+    ap.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    ap.add_argument(
+        "--reuse",
+        action="store_true",
+        help="Reuse the synthetic dataset in --data-dir instead of regenerating.",
+    )
+    ap.add_argument("--repeat", type=int, default=3, help="Runs per benchmark.")
+    ap.add_argument(
+        "--only",
+        nargs="*",
+        choices=GROUPS,
+        help="Only run these benchmark groups (default: all).",
+    )
+    ap.add_argument("--imgsz", type=int, default=IMAGE_SIZE)
+    ap.add_argument("--weights", default=WEIGHTS, help="Weights for inference.")
+    ap.add_argument(
+        "--limit", type=int, default=50, help="Max images for train/inference."
+    )
+    ap.add_argument("--history", type=Path, default=HISTORY)
+    ap.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    ap.add_argument("--no-save", action="store_true", help="Don't append to history.")
+    args = ap.parse_args()
+    groups = set(args.only or GROUPS)
+
+    root = args.data_dir
+    data_yaml = root / "data.yml"
+    results: dict[str, dict] = {}
+
+    # The check benchmarks rename/delete label files and regenerating deletes
+    # the whole directory, so never touch a dataset we didn't generate
+    if root.exists() and any(root.iterdir()) and not is_synthetic(root):
+        ap.error(f"{root} is not a synthetic dataset from synthetic_charts.py")
+
+    if not (args.reuse and data_yaml.exists()):
+        if root.exists():
+            shutil.rmtree(root)
+
+        def gen() -> int:
+            generate(root, args.count, args.resolutions, args.layouts, args.ext)
+            return args.count
+
+        if "generate" in groups:
+            results["generate_synthetic"] = timeit(gen, 1)
+        else:
+            gen()
+
+    # Describe the dataset that is actually benchmarked, also when reused
+    params = load_params(root)
+    if params is None:
+        ap.error(f"{root} has no saved generate() parameters, run without --reuse")
+
+    if "check" in groups:
+        results["check_yolo_dataset"] = timeit(
+            _quiet(lambda: bench_check_dataset(root)), args.repeat
+        )
+        results["validate_label_file"] = timeit(
+            lambda: bench_validate_labels(root), args.repeat
+        )
+        results["align_label_filenames"] = timeit(
+            _quiet(lambda: bench_align_labels(root)), args.repeat
+        )
+        results["dedupe_scan"] = timeit(lambda: bench_dedupe_scan(root), args.repeat)
+
+    if "decode" in groups:
+        paths = sorted(str(p) for p in (root / "images").rglob(f"*{params['ext']}"))
+        paths = paths[: args.limit]
+        for name, decoder in DECODERS.items():
+            results[name] = timeit(partial(decoder, paths, args.imgsz), args.repeat)
+            results[name]["peak_rss_bytes"] = peak_memory(name, paths, args.imgsz)
+
+    if groups & {"train", "inference"}:
+        try:
+            import ultralytics  # noqa: F401
+        except ImportError:
+            print("[Bench] ultralytics not installed, skipping train/inference.")
+            groups -= {"train", "inference"}
+
+    if "train" in groups:
+        run = bench_train_pipeline(data_yaml, args.imgsz, args.limit)
+        results["train_pipeline"] = timeit(run, args.repeat)
+
+    if "inference" in groups:
+        run = bench_inference(root, args.weights, args.imgsz, args.limit)
+        results["inference"] = timeit(run, args.repeat)
+        run = bench_inference_fast(root, args.weights, args.imgsz, args.limit)
+        results["inference_fast"] = timeit(run, args.repeat)
+
+    for name, res in results.items():
+        line = (
+            f"{name:<24} {res['min_s']:.4f}s (min of {res['repeat']}), "
+            f"{res['items']} items, {res['items_per_s'] or 0:.1f} items/s"
+        )
+        if res.get("peak_rss_bytes") is not None:
+            line += f", peak +{res['peak_rss_bytes'] / 2**20:.1f} MiB"
+        print(line)
+
+    commit, dirty = git_commit()
+    record = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "dirty": dirty,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            **params,
+            "imgsz": args.imgsz,
+            "weights": args.weights,
+            "limit": args.limit,
+        },
+        "results": results,
+    }
+
+    history = load_history(args.history)
+    previous = last_matching(history, record["config"])
+    if previous is None:
+        print("[Bench] No earlier run with the same config, skipping comparison.")
+    else:
+        regressions = compare(previous, record, args.threshold)
+        if regressions:
+            n = len(regressions)
+            print(f"[Bench] {n} regression(s) over {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+
+    if not args.no_save:
+        history.append(record)
+        save_history(args.history, history)
+        print(f"[Bench] Appended results to {args.history}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""
+Generate synthetic TradingView-style chart screenshots with YOLO labels.
+
+Every image gets a ``symbol_title`` in the top-left corner and a colored
+``last_price_pill`` on the right price axis, so the output can stand in for the
+real dataset when load-testing the dataset tools, the training pipeline or
+inference.
+
+Usage:
+  python benchmarks/synthetic_charts.py --out benchmarks/synthetic --count 1000
+  python benchmarks/synthetic_charts.py --count 200 --resolutions 1920x1080,3840x2160
+  python benchmarks/synthetic_charts.py --count 200 --layouts dark,light_volume
+"""
+
+import argparse
+import json
+import random
+import shutil
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageFont
+
+SEED = 42
+OUT_DIR = Path("benchmarks/synthetic")
+# Written into every generated dataset, so tools only ever delete or modify these.
+# Holds the generate() parameters as JSON.
+MARKER = ".synthetic_charts"
+
+# Same ids as datasets/tradingview/data.yml
+CLASS_IDS = {"last_price_pill": 0, "symbol_title": 1}
+CLASS_NAMES = ["last_price_pill", "symbol_title"]
+
+SPLIT_FRACTIONS = {"train": 0.7, "val": 0.15, "test": 0.15}
+RESOLUTIONS = [(1920, 1080), (2560, 1440), (1280, 720)]
+
+THEMES = {
+    "dark": {
+        "bg": (19, 23, 34),
+        "grid": (42, 46, 57),
+        "text": (209, 212, 220),
+        "up": (8, 153, 129),
+        "down": (242, 54, 69),
+    },
+    "light": {
+        "bg": (255, 255, 255),
+        "grid": (240, 243, 250),
+        "text": (19, 23, 34),
+        "up": (8, 153, 129),
+        "down": (242, 54, 69),
+    },
+}
+
+# layout name -> (theme, show volume pane, show indicator pane)
+LAYOUTS = {
+    "dark": ("dark", False, False),
+    "light": ("light", False, False),
+    "dark_volume": ("dark", True, False),
+    "light_volume": ("light", True, False),
+    "dark_indicator": ("dark", True, True),
+}
+
+SYMBOLS = ["BTCUSD", "ETHUSDT", "AAPL", "TSLA", "NVDA", "SPX", "EURUSD", "SOLUSDT"]
+EXCHANGES = ["BINANCE", "COINBASE", "NASDAQ", "NYSE", "BYBIT", "OANDA"]
+INTERVALS = ["1", "5", "15", "1h", "4h", "1D", "1W"]
+
+
+def _font(size: int) -> ImageFont.ImageFont:
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:  # Pillow < 10.1 has no sized default font
+        return ImageFont.load_default()
+
+
+def _random_walk(rng: random.Random, n: int, start: float) -> list[tuple]:
+    """Return ``n`` OHLC candles as (open, high, low, close) tuples."""
+    candles = []
+    price = start
+    for _ in range(n):
+        o = price
+        c = max(o * (1 + rng.gauss(0, 0.012)), 0.01)
+        h = max(o, c) * (1 + abs(rng.gauss(0, 0.005)))
+        lo = min(o, c) * (1 - abs(rng.gauss(0, 0.005)))
+        candles.append((o, h, lo, c))
+        price = c
+    return candles
+
+
+def _yolo_line(cls_name: str, box: tuple, width: int, height: int) -> str:
+    """Convert a pixel (x0, y0, x1, y1) box to a normalized YOLO label line."""
+    x0, y0, x1, y1 = box
+    x0, x1 = max(0, x0), min(width, x1)
+    y0, y1 = max(0, y0), min(height, y1)
+    cx = (x0 + x1) / 2 / width
+    cy = (y0 + y1) / 2 / height
+    w = (x1 - x0) / width
+    h = (y1 - y0) / height
+    return f"{CLASS_IDS[cls_name]} {cx:.6f} {cy:.6f} {w:.6f} {h:.6f}"
+
+
+def render_chart(
+    rng: random.Random, width: int, height: int, layout: str
+) -> tuple[Image.Image, list[str]]:
+    """
+    Draw one chart and return (image, YOLO label lines).
+
+    The ``symbol_title`` box covers the title text in the top-left and the
+    ``last_price_pill`` box covers the colored pill on the right price axis.
+    """
+    theme_name, show_volume, show_indicator = LAYOUTS[layout]
+    theme = THEMES[theme_name]
+    scale = height / 1080
+
+    img = Image.new("RGB", (width, height), theme["bg"])
+    draw = ImageDraw.Draw(img)
+    font = _font(max(10, round(22 * scale)))
+    small = _font(max(8, round(16 * scale)))
+
+    axis_w = round(rng.uniform(70, 100) * scale)
+    top = round(60 * scale)
+    bottom = height - round(30 * scale)
+    plot_right = width - axis_w
+
+    # Split the vertical space between price, volume and indicator panes
+    pane_h = bottom - top
+    price_bottom = bottom
+    if show_indicator:
+        price_bottom -= round(pane_h * 0.2)
+        draw.line([(0, price_bottom), (plot_right, price_bottom)], fill=theme["grid"])
+    vol_bottom = price_bottom
+    if show_volume:
+        price_bottom -= round(pane_h * 0.15)
+
+    # Grid
+    for gx in range(0, plot_right, max(1, round(120 * scale))):
+        draw.line([(gx, top), (gx, bottom)], fill=theme["grid"])
+    for gy in range(top, bottom, max(1, round(80 * scale))):
+        draw.line([(0, gy), (plot_right, gy)], fill=theme["grid"])
+
+    # Candles
+    n = rng.randint(60, 200)
+    candles = _random_walk(rng, n, rng.uniform(1, 70000))
+    lo = min(c[2] for c in candles)
+    hi = max(c[1] for c in candles)
+    span = (hi - lo) or 1.0
+    pad = round(20 * scale)
+
+    def price_y(p: float) -> float:
+        return top + pad + (hi - p) / span * (price_bottom - top - 2 * pad)
+
+    step = plot_right / n
+    body_w = max(1, round(step * 0.6))
+    volumes = [rng.uniform(0.1, 1.0) for _ in candles]
+    for i, (o, h, low, c) in enumerate(candles):
+        x = round(i * step + step / 2)
+        color = theme["up"] if c >= o else theme["down"]
+        draw.line([(x, price_y(h)), (x, price_y(low))], fill=color)
+        y0, y1 = sorted((price_y(o), price_y(c)))
+        draw.rectangle(
+            [x - body_w // 2, y0, x + body_w // 2, max(y1, y0 + 1)], fill=color
+        )
+        if show_volume:
+            vh = volumes[i] * (vol_bottom - price_bottom) * 0.9
+            draw.rectangle(
+                [x - body_w // 2, vol_bottom - vh, x + body_w // 2, vol_bottom],
+                fill=color,
+            )
+    if show_indicator:
+        ind_h = bottom - vol_bottom
+        pts = [
+            (round(i * step + step / 2), bottom - rng.uniform(0.1, 0.9) * ind_h)
+            for i in range(n)
+        ]
+        draw.line(pts, fill=(126, 87, 194), width=max(1, round(2 * scale)))
+
+    # Right price axis
+    draw.line([(plot_right, 0), (plot_right, height)], fill=theme["grid"])
+    decimals = 2 if hi < 1000 else 1
+    for k in range(8):
+        p = lo + span * k / 7
+        draw.text(
+            (plot_right + round(8 * scale), price_y(p)),
+            f"{p:.{decimals}f}",
+            fill=theme["text"],
+            font=small,
+            anchor="lm",
+        )
+
+    labels = []
+
+    # Symbol title in the top-left
+    title = f"{rng.choice(SYMBOLS)} · {rng.choice(INTERVALS)} · {rng.choice(EXCHANGES)}"
+    tx, ty = round(rng.uniform(8, 20) * scale), round(rng.uniform(8, 20) * scale)
+    title_box = draw.textbbox((tx, ty), title, font=font)
+    draw.text((tx, ty), title, fill=theme["text"], font=font)
+    labels.append(_yolo_line("symbol_title", title_box, width, height))
+
+    # OHLC line next to the title, not labelled (distractor)
+    o, h, low, c = candles[-1]
+    ohlc = f"O{o:.{decimals}f} H{h:.{decimals}f} L{low:.{decimals}f} C{c:.{decimals}f}"
+    draw.text(
+        (title_box[2] + round(16 * scale), ty), ohlc, fill=theme["text"], font=small
+    )
+
+    # Last price pill on the axis, colored by the last candle's direction
+    last = candles[-1]
+    pill_color = theme["up"] if last[3] >= last[0] else theme["down"]
+    pill_text = f"{last[3]:.{decimals}f}"
+    cy = price_y(last[3])
+    text_box = draw.textbbox(
+        (plot_right + round(8 * scale), cy), pill_text, font=small, anchor="lm"
+    )
+    px = round(4 * scale)
+    pill_box = (
+        plot_right + 1,
+        text_box[1] - px,
+        width - 1,
+        text_box[3] + px,
+    )
+    draw.line([(0, cy), (plot_right, cy)], fill=pill_color, width=1)
+    draw.rounded_rectangle(pill_box, radius=round(3 * scale), fill=pill_color)
+    draw.text(
+        (plot_right + round(8 * scale), cy),
+        pill_text,
+        fill=(255, 255, 255),
+        font=small,
+        anchor="lm",
+    )
+    labels.append(_yolo_line("last_price_pill", pill_box, width, height))
+
+    return img, labels
+
+
+def write_data_yaml(out: Path) -> Path:
+    """Write a data.yml in the same format as datasets/tradingview/data.yml."""
+    data_yaml = out / "data.yml"
+    data_yaml.write_text(
+        f"path: {out.resolve().as_posix()}\n"
+        "train: images/train\n"
+        "val: images/val\n"
+        "test: images/test\n"
+        f"names: [{', '.join(CLASS_NAMES)}]\n",
+        encoding="utf-8",
+    )
+    return data_yaml
+
+
+def is_synthetic(root: Path) -> bool:
+    """Return True if ``root`` was written by generate()."""
+    return (root / MARKER).exists()
+
+
+def load_params(root: Path) -> dict | None:
+    """Return the generate() parameters saved in ``root``, if any."""
+    try:
+        return json.loads((root / MARKER).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def generate(
+    out: Path = OUT_DIR,
+    count: int = 100,
+    resolutions: list[tuple[int, int]] | None = None,
+    layouts: list[str] | None = None,
+    ext: str = ".png",
+    seed: int = SEED,
+) -> Path:
+    """
+    Generate ``count`` synthetic charts in YOLO layout under ``out``.
+
+    Images are spread over train/val/test using SPLIT_FRACTIONS and cycle through
+    the given resolutions and layouts. Returns the path to the written data.yml.
+    Refuses to write into a non-empty directory that generate() did not create,
+    and clears the images and labels of an earlier run before writing.
+    """
+    if out.exists() and any(out.iterdir()) and not is_synthetic(out):
+        raise FileExistsError(f"{out} is not empty and not a synthetic dataset")
+    resolutions = resolutions or RESOLUTIONS
+    layouts = layouts or list(LAYOUTS)
+    unknown = [name for name in layouts if name not in LAYOUTS]
+    if unknown:
+        raise ValueError(f"Unknown layouts {unknown}, choose from {list(LAYOUTS)}")
+
+    for sub in ("images", "labels"):
+        shutil.rmtree(out / sub, ignore_errors=True)
+    out.mkdir(parents=True, exist_ok=True)
+    params = {
+        "count": count,
+        "resolutions": [f"{w}x{h}" for w, h in resolutions],
+        "layouts": layouts,
+        "ext": ext,
+        "seed": seed,
+    }
+    (out / MARKER).write_text(json.dumps(params, indent=2), encoding="utf-8")
+    rng = random.Random(seed)
+    n_train = int(count * SPLIT_FRACTIONS["train"])
+    n_val = int(count * SPLIT_FRACTIONS["val"])
+    split_counts = {"train": n_train, "val": n_val, "test": count - n_train - n_val}
+
+    k = 0
+    for split, n in split_counts.items():
+        imgd = out / "images" / split
+        lbld = out / "labels" / split
+        imgd.mkdir(parents=True, exist_ok=True)
+        lbld.mkdir(parents=True, exist_ok=True)
+        for i in range(n):
+            width, height = resolutions[k % len(resolutions)]
+            layout = layouts[k % len(layouts)]
+            k += 1
+            img, labels = render_chart(rng, width, height, layout)
+            img.save(imgd / f"chart_{i:04d}{ext}")
+            (lbld / f"chart_{i:04d}.txt").write_text("\n".join(labels) + "\n")
+
+    (out / "labels" / "train" / "classes.txt").write_text("\n".join(CLASS_NAMES) + "\n")
+    return write_data_yaml(out)
+
+
+def parse_resolutions(value: str) -> list[tuple[int, int]]:
+    """Parse '1920x1080,3840x2160' into [(1920, 1080), (3840, 2160)]."""
+    out = []
+    for part in value.split(","):
+        w, h = part.lower().split("x")
+        out.append((int(w), int(h)))
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out", type=Path, default=OUT_DIR, help="Output dataset root.")
+    ap.add_argument("--count", type=int, default=100, help="Number of images.")
+    ap.add_argument(
+        "--resolutions",
+        type=parse_resolutions,
+        default=RESOLUTIONS,
+        help="Comma separated WxH list, e.g. 1920x1080,3840x2160.",
+    )
+    ap.add_argument(
+        "--layouts",
+        type=lambda v: v.split(","),
+        default=list(LAYOUTS),
+        help=f"Comma separated layouts from: {', '.join(LAYOUTS)}.",
+    )
+    ap.add_argument(
+        "--ext", choices=[".png", ".jpg"], default=".png", help="Image format."
+    )
+    ap.add_argument("--seed", type=int, default=SEED)
+    args = ap.parse_args()
+
+    data_yaml = generate(
+        args.out, args.count, args.resolutions, args.layouts, args.ext, args.seed
+    )
+    print(f"Wrote {args.count} synthetic charts to {args.out} ({data_yaml})")
+
+
+if __name__ == "__main__":
+    main()
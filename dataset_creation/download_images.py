@@ -30,7 +30,9 @@ def _ensure_dirs() -> None:
 
 def _save_pil(img: Image.Image, path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    img.convert("RGB").save(path)
+    if img.mode != "RGB":  # avoid a full copy for images that already are RGB
+        img = img.convert("RGB")
+    img.save(path)
 
 
 def _iter_filtered(ds) -> Iterable[tuple[int, Image.Image]]:
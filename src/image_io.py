@@ -0,0 +1,197 @@
+"""
+Shared image loading with reduced-resolution decoding and buffer reuse.
+
+JPEGs are decoded at the smallest DCT scale (1/2, 1/4 or 1/8) that still covers
+the requested size, other formats are shrunk with PIL's ``reduce`` before the
+final resize. The decoded pixels are then copied once, in small chunks, into a
+preallocated NumPy buffer that is reused between images, so no full-size
+temporary array is allocated per image. That chunked copy uses Pillow's private
+raw encoder (``Image._getencoder``, ``Image.im``), with a fallback to
+``Image.tobytes()`` should those change in a future Pillow release.
+
+Example:
+  buf = alloc_buffer(1792)
+  for path in paths:
+      img = decode_into(path, buf, max_size=1792, bgr=True)
+      model.predict(img)  # img is a view into buf, only valid until the next decode
+"""
+
+import io
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+from PIL import Image, ImageFile
+
+ImageSource = Union[str, Path, bytes, bytearray, memoryview, Image.Image]
+
+# Let resize() first shrink by an integer factor with reduce() as long as the
+# result stays >= 2x the target size, see Pillow's Image.resize docs
+REDUCING_GAP = 2.0
+RESAMPLE = Image.Resampling.BILINEAR
+# Modes that resize the same way as after converting to RGB. RGBA/LA would be
+# resized with premultiplied alpha, turning transparent pixels black
+RESIZE_MODES = ("RGB", "L")
+
+
+class _MemoryReader(io.RawIOBase):
+    """Seekable read-only file object over a buffer, without copying it."""
+
+    def __init__(self, buf: Union[bytearray, memoryview]) -> None:
+        self._view = memoryview(buf).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        n = max(0, min(len(b), len(self._view) - self._pos))
+        b[:n] = self._view[self._pos : self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence {whence}")
+        if pos < 0:
+            raise ValueError(f"Negative seek position {pos}")
+        self._pos = pos
+        return pos
+
+    def tell(self) -> int:
+        return self._pos
+
+
+def open_image(src: ImageSource) -> Image.Image:
+    """
+    Lazily open ``src`` without decoding the pixels yet.
+
+    ``bytes`` are wrapped in a BytesIO (which shares the buffer in CPython),
+    ``bytearray`` and ``memoryview`` are read in place.
+    """
+    if isinstance(src, Image.Image):
+        return src
+    if isinstance(src, bytes):
+        return Image.open(io.BytesIO(src))
+    if isinstance(src, (bytearray, memoryview)):
+        return Image.open(_MemoryReader(src))
+    return Image.open(src)
+
+
+def fit_size(width: int, height: int, max_size: int) -> tuple[int, int]:
+    """Return (width, height) scaled so the longest side is <= ``max_size``."""
+    scale = max_size / max(width, height)
+    if scale >= 1:
+        return width, height
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def load_image(src: ImageSource, max_size: int | None = None) -> Image.Image:
+    """
+    Decode ``src`` as RGB with its longest side at most ``max_size``.
+
+    Images are never upscaled. RGB and grayscale images are converted after
+    downscaling, other modes before. Reduced-resolution JPEG decoding only
+    applies to paths and bytes, an ``Image.Image`` passed in is never modified.
+    """
+    img = open_image(src)
+    target = fit_size(*img.size, max_size) if max_size else img.size
+
+    if img.format == "JPEG" and not isinstance(src, Image.Image):
+        # Decode straight to RGB at the smallest DCT scale covering target
+        img.draft("RGB", target)
+    if not isinstance(src, Image.Image):
+        # Decode now, which also closes the file we opened
+        img.load()
+
+    if img.mode not in RESIZE_MODES:
+        img = img.convert("RGB")
+    if img.size != target:
+        img = img.resize(target, RESAMPLE, reducing_gap=REDUCING_GAP)
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    return img
+
+
+def _write_pixels(img: Image.Image, dest: np.ndarray, rawmode: str) -> None:
+    """Copy the pixels of ``img`` into the flat uint8 array ``dest``."""
+    # Same encoder loop as Image.tobytes(), but writing each chunk into dest
+    # instead of joining them into one full-size bytes object
+    img.load()
+    try:
+        encoder = Image._getencoder(img.mode, "raw", rawmode)
+        encoder.setimage(img.im, (0, 0) + img.size)
+    except (AttributeError, TypeError):
+        # Private API changed: slower, but still correct
+        dest[:] = np.frombuffer(img.tobytes("raw", rawmode), dtype=np.uint8)
+        return
+    bufsize = max(ImageFile.MAXBLOCK, img.size[0] * 4)
+    pos = 0
+    while True:
+        _, errcode, data = encoder.encode(bufsize)
+        dest[pos : pos + len(data)] = np.frombuffer(data, dtype=np.uint8)
+        pos += len(data)
+        if errcode:
+            break
+    if errcode < 0:
+        raise RuntimeError(f"Encoder error {errcode} while copying pixels")
+
+
+def alloc_buffer(max_size: int) -> np.ndarray:
+    """Allocate a reusable (max_size, max_size, 3) uint8 buffer for decode_into."""
+    return np.empty((max_size, max_size, 3), dtype=np.uint8)
+
+
+def decode_into(
+    src: ImageSource,
+    out: np.ndarray,
+    max_size: int | None = None,
+    bgr: bool = False,
+) -> np.ndarray:
+    """
+    Decode ``src`` into ``out`` and return a (height, width, 3) array holding it.
+
+    Parameters
+    ----------
+    src : ImageSource
+        Path, encoded bytes/bytearray/memoryview or an opened PIL image.
+    out : np.ndarray
+        C-contiguous uint8 buffer of shape (H, W, 3), e.g. from alloc_buffer.
+        Must hold at least height * width pixels of the decoded image.
+    max_size : int | None
+        Longest side of the decoded image, defaults to the original size.
+    bgr : bool
+        Write channels in BGR order, as ultralytics/OpenCV expect for arrays.
+
+    Returns
+    -------
+    np.ndarray
+        Contiguous view on the start of ``out``. It is overwritten by the next
+        decode into ``out``.
+    """
+    if out.dtype != np.uint8 or out.ndim != 3 or out.shape[2] != 3:
+        raise ValueError(f"Expected a (H, W, 3) uint8 buffer, got {out.shape}")
+    if not out.flags.c_contiguous:
+        raise ValueError("Buffer must be C-contiguous")
+
+    img = load_image(src, max_size)
+    width, height = img.size
+    n = width * height * 3
+    if n > out.size:
+        raise ValueError(
+            f"Decoded image {width}x{height} does not fit buffer "
+            f"{out.shape[1]}x{out.shape[0]}"
+        )
+
+    flat = out.reshape(-1)[:n]
+    _write_pixels(img, flat, "BGR" if bgr else "RGB")
+    return flat.reshape(height, width, 3)